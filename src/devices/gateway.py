@@ -3,10 +3,11 @@
 from .sensor_node import SensorNode
 
 class Gateway(SensorNode):
-    def __init__(self, env, node_id, pos, broker, gateway_lookup_fn=None):
-        super().__init__(env, node_id, pos, "wifi", broker, gateway_lookup_fn)
+    def __init__(self, env, node_id, pos, broker, gateway_lookup_fn=None, rng=None):
+        super().__init__(env, node_id, pos, "wifi", broker, gateway_lookup_fn, rng)
         self.battery_j = float('inf')
         self.is_gateway = True
+        self.gui_type = "Gateway"
         # Coordinator starts Active
         self.state = "active"
 
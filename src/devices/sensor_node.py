@@ -6,11 +6,12 @@ from ..mqtt.client import MqttClient
 
 
 class SensorNode:
-    def __init__(self, env, node_id, pos, radio_type, broker, network_lookup_fn):
+    def __init__(self, env, node_id, pos, radio_type, broker, network_lookup_fn, rng=None):
         self.env = env
         self.id = node_id
         self.x, self.y = pos
         self.network_lookup_fn = network_lookup_fn
+        self.rng = rng  # Seeded simulation RNG (None = global random module)
 
         self.radio = create_radio(radio_type, env)
         self.mqtt = MqttClient(env, node_id, broker, self.radio, self)
@@ -19,6 +20,11 @@ class SensorNode:
         self.state = "scanning"
         self.active = True
         self.connected_parent_id = None
+        self.gui_type = "Sensor"  # Display label; the loader sets the palette type on creation
+        self.on_change = None  # Optional callback fired on GUI-visible state/position changes
+        # get_network_link result, reused until sim time advances or this node changes
+        self._link_cache_t = -1.0
+        self._link_cache = None
 
         self.topic_root = "sensors"
         if "iPhone" in node_id or "Mobile" in node_id:
@@ -29,31 +35,50 @@ class SensorNode:
         self.process = self.env.process(self.app_loop())
 
     def get_network_link(self):
+        now = self.env.now
+        if now == self._link_cache_t:
+            return self._link_cache
+        self._link_cache = link = self._find_network_link()
+        self._link_cache_t = now
+        return link
+
+    def invalidate_link_cache(self):
+        self._link_cache_t = -1.0
+
+    def _find_network_link(self):
         all_nodes = self.network_lookup_fn()
 
         # Heuristic: Mesh if range is short (<100m)
-        is_mesh = False
-        if isinstance(self.radio.config.get('range_m'), (int, float)):
-            if self.radio.config['range_m'] < 100: is_mesh = True
+        is_mesh = self.radio.range_m < 100
 
+        # Compare squared distances; only the chosen parent's distance needs a sqrt
+        can_reach_sq = self.radio.can_reach_sq
+        x, y = self.x, self.y
         candidates = []
         for n in all_nodes:
             if n.id == self.id: continue
 
-            dist = math.hypot(self.x - n.x, self.y - n.y)
-            if not self.radio.can_reach(dist): continue
+            dx, dy = x - n.x, y - n.y
+            dist_sq = dx * dx + dy * dy
+            if not can_reach_sq(dist_sq): continue
 
             # Robust Gateway Check (Partial string match)
             if "Gate" in n.id or getattr(n, "is_gateway", False):
-                candidates.append((dist, n.id))
+                candidates.append((dist_sq, n.id))
             # Mesh Check: Connect to active sensors if in mesh mode
             elif is_mesh and n.state == "active" and n.active:
-                candidates.append((dist, n.id))
+                candidates.append((dist_sq, n.id))
 
         if not candidates: return None
         # Connect to closest valid parent
         candidates.sort(key=lambda x: x[0])
-        return candidates[0]
+        dist_sq, parent_id = candidates[0]
+        return math.sqrt(dist_sq), parent_id
+
+    def mark_dirty(self):
+        self.invalidate_link_cache()
+        if self.on_change is not None:
+            self.on_change()
 
     def consume_energy(self, joules):
         self.battery_j -= joules
@@ -63,6 +88,7 @@ class SensorNode:
         if self.battery_j <= 0:
             self.state = "dead"
             self.active = False
+            self.mark_dirty()
 
     def toggle_connection(self):
         if self.state == "disconnected":
@@ -72,13 +98,17 @@ class SensorNode:
             self.state = "disconnected"
             self.mqtt.connected = False
             self.connected_parent_id = None
+        self.mqtt.wake()
+        self.mark_dirty()
 
     def stop(self):
         self.active = False
         self.state = "dead"
+        self.mark_dirty()
 
     def app_loop(self):
-        yield self.env.timeout(random.uniform(0, 2))
+        rng = self.rng or random
+        yield self.env.timeout(rng.uniform(0, 2))
         while self.active and self.battery_j > 0:
             if self.state == "disconnected":
                 yield self.env.timeout(1.0)
@@ -89,12 +119,12 @@ class SensorNode:
             if self.mqtt.connected:
                 topic = "unknown"
                 if self.topic_root == "mobile":
-                    topic = random.choice(["mobile/gps", "mobile/status"])
+                    topic = rng.choice(["mobile/gps", "mobile/status"])
                 elif self.topic_root == "workstation":
-                    topic = random.choice(["work/file_sync", "work/email"])
+                    topic = rng.choice(["work/file_sync", "work/email"])
                 else:
-                    topic = random.choice(["sensors/temp", "sensors/humidity"])
+                    topic = rng.choice(["sensors/temp", "sensors/humidity"])
 
                 self.mqtt.publish(topic, 25.0, qos=1)
 
-            yield self.env.timeout(random.uniform(0.8, 2.5))
\ No newline at end of file
+            yield self.env.timeout(rng.uniform(0.8, 2.5))
\ No newline at end of file
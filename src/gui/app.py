@@ -65,6 +65,19 @@ class ModernIotApp(tk.Tk):
         self.style.configure("Accent.TButton", background=COLORS["primary"], foreground="white")
         self.style.configure("Danger.TButton", background=COLORS["danger"], foreground="white")
         self.style.configure("Toolbar.TFrame", background="#FFFFFF")
+        # StatsPanel cards
+        self.style.configure("StatCard.TFrame", background="#F9F9F9", relief="flat")
+        self.style.configure("StatTitle.TLabel", background="#F9F9F9", foreground="#7f8c8d",
+                             font=("Segoe UI", 8, "bold"))
+        self.style.configure("StatValue.TLabel", background="#F9F9F9", foreground="#2c3e50",
+                             font=("Segoe UI", 14, "bold"))
+        # Horizontal separator backed by a 40px source image: Tk tiles the image to fill the
+        # widget, so a wider source means far fewer tile copies on every resize. Keep a
+        # reference on self or Tk drops the image.
+        self._sep_img = tk.PhotoImage(master=self, width=40, height=1)
+        self._sep_img.put("#C8D0D6", to=(0, 0, 40, 1))
+        self.style.element_create("wide.hseparator", "image", self._sep_img)
+        self.style.layout("Wide.TSeparator", [("wide.hseparator", {"sticky": "we"})])
 
     def _build_layout(self):
         toolbar = ttk.Frame(self, style="Toolbar.TFrame", padding=15)
@@ -136,7 +149,7 @@ class ModernIotApp(tk.Tk):
         if hasattr(self, 'btn_run'): self.btn_run.config(text="▶ START")
         self.sim_env = SimulationEnvironment()
         self.metrics = MetricsCollector()
-        self.loader = ScenarioLoader(self.sim_env.env, self.metrics)
+        self.loader = ScenarioLoader(self.sim_env.env, self.metrics, rng=self.sim_env.rng)
         self.history = {"queue": [0] * 50}
         proto = "e3"
         if hasattr(self, 'palette') and self.palette.sim_type_var.get():
@@ -165,7 +178,7 @@ class ModernIotApp(tk.Tk):
             self.is_running = False
             self.sim_env = SimulationEnvironment()
             self.metrics = MetricsCollector()
-            self.loader = ScenarioLoader(self.sim_env.env, self.metrics)
+            self.loader = ScenarioLoader(self.sim_env.env, self.metrics, rng=self.sim_env.rng)
             self.history = {"queue": [0] * 50}
             self.loader.load_from_snapshot(path)
             self._refresh_gui_data()
@@ -215,9 +228,10 @@ class ModernIotApp(tk.Tk):
         for n_data in nodes:
             real_node = self.loader.get_node(n_data['id'])
             if real_node and hasattr(real_node, 'radio'):
-                n_data['range'] = real_node.radio.config.get('range_m', 50)
+                n_data['range'] = real_node.radio.range_m
         current_sel = self.info_panel.current_node['id'] if self.info_panel.current_node else None
-        self.map_view.update_state(nodes, [], current_sel, [], {})
+        self.map_view.update_state(nodes, [], current_sel, [], {},
+                                   node_arrays=self.loader.get_gui_node_arrays())
         self.stats_panel.update_metrics(self.metrics)
 
         if hasattr(self, 'node_table'):
@@ -248,12 +262,14 @@ class ModernIotApp(tk.Tk):
         self.reset_simulation()
 
     def on_node_selected(self, node_id):
-        nodes = self.loader.get_gui_node_data()
-        node_data = next((n for n in nodes if n['id'] == node_id), None)
-        if node_data:
+        self.loader.get_gui_node_data()
+        row = self.loader.get_gui_row(node_id)
+        if row:
+            # Copy: rows are shared with the map/table and refreshed in place
+            node_data = dict(row)
             real_node = self.loader.get_node(node_id)
             if real_node:
-                node_data['range'] = real_node.radio.config.get('range_m', 50)
+                node_data['range'] = real_node.radio.range_m
             self.info_panel.show_node_details(node_data)
             self.map_view.selected_node_id = node_id
             self.map_view._draw_map()
@@ -273,14 +289,19 @@ class ModernIotApp(tk.Tk):
         if node:
             node.x = new_x
             node.y = new_y
-            if "Gateway" in node_id or isinstance(node, self.loader.get_node("Gateway").__class__):
+            self.loader.mobility.relocate(node)
+            node.mark_dirty()
+            if getattr(node, "is_gateway", False):
                 self.loader.gw_pos = (new_x, new_y)
+            # Re-sync rows and hit-test arrays now; while paused no frame would do it
+            self._refresh_gui_data()
 
     def on_node_edited(self, node_id, changes):
         node = self.loader.get_node(node_id)
         if not node: return
         if 'range' in changes and hasattr(node, 'radio'):
-            node.radio.config['range_m'] = float(changes['range'])
+            node.radio.set_range(changes['range'])
+            node.mark_dirty()
         if 'state' in changes:
             if changes['state'] == 'dead':
                 node.stop()
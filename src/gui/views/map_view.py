@@ -12,8 +12,10 @@ class InteractiveMapView(tk.Frame):
         self.on_bg_click = on_bg_click
         self.on_node_move = on_node_move
         self.nodes_cache = []
+        self.node_arrays = None
         self.selected_node_id = None
         self.dragging_node = None
+        self.drag_pos = None
 
         # Viewport State
         self.xlim = [0, 500]
@@ -38,8 +40,9 @@ class InteractiveMapView(tk.Frame):
 
         self._setup_ax()
 
-    def update_state(self, nodes, walls, selected_id, queue_history, topic_counts=None):
+    def update_state(self, nodes, walls, selected_id, queue_history, topic_counts=None, node_arrays=None):
         self.nodes_cache = nodes
+        self.node_arrays = node_arrays
         self.selected_node_id = selected_id
         if not self.dragging_node and not self.is_panning:
             self._draw_map()
@@ -103,6 +106,13 @@ class InteractiveMapView(tk.Frame):
         for spine in self.ax.spines.values(): spine.set_visible(False)
         self.ax.tick_params(left=False, bottom=False, labelleft=False, labelbottom=False)
 
+    def _live_arrays(self):
+        # Only trust the loader's arrays while they still line up with the cached rows
+        arrays = self.node_arrays
+        if arrays is not None and len(arrays['x']) == len(self.nodes_cache):
+            return arrays
+        return None
+
     # --- Interaction Handlers ---
     def _on_scroll(self, event):
         """Zoom Logic"""
@@ -148,10 +158,17 @@ class InteractiveMapView(tk.Frame):
         zoom_factor = (self.xlim[1] - self.xlim[0]) / 500
         click_radius = 20 * zoom_factor
 
-        for n in self.nodes_cache:
-            if np.sqrt((n['x'] - event.xdata) ** 2 + (n['y'] - event.ydata) ** 2) < click_radius:
-                clicked = n;
-                break
+        arrays = self._live_arrays()
+        if arrays is not None:
+            dist = np.hypot(arrays['x'] - event.xdata, arrays['y'] - event.ydata)
+            hits = np.flatnonzero(dist < click_radius)
+            if hits.size:
+                clicked = self.nodes_cache[hits[0]]
+        else:
+            for n in self.nodes_cache:
+                if np.sqrt((n['x'] - event.xdata) ** 2 + (n['y'] - event.ydata) ** 2) < click_radius:
+                    clicked = n;
+                    break
 
         if clicked:
             self.dragging_node = clicked
@@ -175,11 +192,15 @@ class InteractiveMapView(tk.Frame):
         if self.dragging_node:
             self.dragging_node['x'] = event.xdata
             self.dragging_node['y'] = event.ydata
+            # Rows are refreshed in place by the loader, so remember the drop point separately
+            self.drag_pos = (event.xdata, event.ydata)
             self._draw_map()
 
     def _on_release(self, event):
         self.is_panning = False
         self.pan_start = None
         if self.dragging_node:
-            self.on_node_move(self.dragging_node['id'], self.dragging_node['x'], self.dragging_node['y'])
-            self.dragging_node = None
\ No newline at end of file
+            if self.drag_pos:
+                self.on_node_move(self.dragging_node['id'], *self.drag_pos)
+            self.dragging_node = None
+            self.drag_pos = None
\ No newline at end of file
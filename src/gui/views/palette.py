@@ -27,7 +27,7 @@ class NodePalette(ttk.Frame):
         cb.pack(fill="x", pady=(0, 10))
         cb.bind("<<ComboboxSelected>>", self._on_sim_change)
 
-        ttk.Separator(self, orient="horizontal").pack(fill="x", pady=10)
+        ttk.Separator(self, orient="horizontal", style="Wide.TSeparator").pack(fill="x", pady=10)
 
         ttk.Label(self, text="Drag & Drop Nodes:", style="Card.TLabel", font=("Segoe UI", 9, "bold")).pack(anchor="w",
                                                                                                            pady=(0, 5))
@@ -0,0 +1,22 @@
+import tkinter as tk
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.figure import Figure
+
+
+class PlotHost(tk.Frame):
+    """Owns one Figure + FigureCanvasTkAgg; plot views draw into its Axes."""
+
+    def __init__(self, parent, nrows=1, figsize=(5, 3), dpi=80, **margins):
+        super().__init__(parent)
+        self.fig = Figure(figsize=figsize, dpi=dpi)
+        self.axes = list(self.fig.subplots(nrows, 1, squeeze=False)[:, 0])
+        if margins:
+            self.fig.subplots_adjust(**margins)
+
+        self.canvas = FigureCanvasTkAgg(self.fig, master=self)
+        self.canvas.draw()
+        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+
+    def refresh(self):
+        # draw_idle coalesces every child update made this frame into one Agg render
+        self.canvas.draw_idle()
@@ -1,38 +1,64 @@
 import tkinter as tk
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from matplotlib.figure import Figure
+
+LINE_COLOR = '#e74c3c'
+FILL_COLOR = '#fadbd8'  # Tk has no alpha, so pre-blend the 10% red fill
+GRID_COLOR = '#dcdde1'
+
 
 class QueueSparkline(tk.Frame):
     def __init__(self, parent):
         super().__init__(parent)
 
-        self.fig = Figure(figsize=(5, 2), dpi=80)
-        self.ax = self.fig.add_subplot(111)
-        # Tight layout for sparkline feel
-        self.fig.subplots_adjust(bottom=0.15, top=0.9, left=0.1, right=0.95)
+        self.cv = tk.Canvas(self, height=160, bg='white', highlightthickness=0)
+        self.cv.pack(fill=tk.BOTH, expand=True)
 
-        self.canvas = FigureCanvasTkAgg(self.fig, master=self)
-        self.canvas.draw()
-        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        # Static decoration: only re-laid out when the canvas is resized
+        self._grid_ids = [self.cv.create_line(0, 0, 0, 0, fill=GRID_COLOR, dash=(1, 3)) for _ in range(4)]
+        self._label_id = self.cv.create_text(4, 2, text="Depth", anchor='nw', fill='#7f8c8d', font=("Segoe UI", 8))
+        self._max_id = self.cv.create_text(0, 2, text="", anchor='ne', fill='#7f8c8d', font=("Segoe UI", 8))
 
-    def update_plot(self, queue_history):
-        self.ax.clear()
+        # Dynamic items: mutated in place via coords() every frame
+        self._fill_id = self.cv.create_polygon(0, 0, 0, 0, 0, 0, fill=FILL_COLOR, outline='')
+        self._line_id = self.cv.create_line(0, 0, 0, 0, fill=LINE_COLOR, width=2)
 
+        self._history = [0] * 50
+        self._y_max = None
+        self.cv.bind("<Configure>", self._on_resize)
+
+    def _on_resize(self, event):
+        w, h = event.width, event.height
+        for i, gid in enumerate(self._grid_ids, start=1):
+            y = h * i / (len(self._grid_ids) + 1)
+            self.cv.coords(gid, 0, y, w, y)
+        self.cv.coords(self._max_id, w - 4, 2)
+        self._redraw()
+
+    def update_plot(self, queue_history):
         # Ensure we have data to plot
-        if not queue_history:
-            queue_history = [0] * 50
+        self._history = queue_history or [0] * 50
+        self._redraw()
 
-        x_data = range(len(queue_history))
-        self.ax.plot(x_data, queue_history, color='#e74c3c', linewidth=1.5)
-        self.ax.fill_between(x_data, queue_history, color='#e74c3c', alpha=0.1)
+    def _redraw(self):
+        w, h = self.cv.winfo_width(), self.cv.winfo_height()
+        if w <= 1 or h <= 1:
+            return  # Not mapped yet; <Configure> will trigger the first draw
 
-        # Force Y-limit so a flatline at 0 looks intentional (at bottom) not middle
-        current_max = max(queue_history) if queue_history else 0
-        self.ax.set_ylim(0, max(5, current_max * 1.2))
+        history = self._history
+        n = len(history)
+        # Keep a flatline at 0 on the bottom edge, with headroom above the peak
+        y_max = max(5, max(history) * 1.2)
+        if y_max != self._y_max:
+            self._y_max = y_max
+            self.cv.itemconfigure(self._max_id, text=f"{y_max:.0f}")
 
-        self.ax.grid(True, linestyle=':', alpha=0.5)
-        self.ax.set_ylabel("Depth", fontsize=8)
-        self.ax.set_xticks([]) # Hide X axis time
-        self.ax.tick_params(axis='y', labelsize=8)
+        x_step = w / max(1, n - 1)
+        y_scale = (h - 2) / y_max
+        coords = []
+        for i, v in enumerate(history):
+            coords.append(i * x_step)
+            coords.append(h - 1 - v * y_scale)
+        if n == 1:
+            coords += [w, coords[1]]
 
-        self.canvas.draw()
\ No newline at end of file
+        self.cv.coords(self._line_id, *coords)
+        self.cv.coords(self._fill_id, 0, h, *coords, w, h)
@@ -21,6 +21,8 @@ class StatsPanel(ttk.Frame):
             "Duplicates": tk.StringVar(value="0"),
             "Energy (J)": tk.StringVar(value="0.0"),
         }
+        # Last text pushed to each StringVar, so unchanged values skip the Tcl round-trip
+        self._last = {k: v.get() for k, v in self.metrics_labels.items()}
 
         # Create 2x2 Grid of Stat Cards
         self._create_stat_card(0, 0, "Delivery Ratio", self.metrics_labels["Delivery Ratio"], "#2ECC71")
@@ -30,28 +32,35 @@ class StatsPanel(ttk.Frame):
 
     def _create_stat_card(self, r, c, title, variable, accent):
         # Mini Card
-        f = tk.Frame(self.grid_frame, bg="#F9F9F9", padx=10, pady=10, relief="flat")
+        # Styles are registered once by the app (StatCard/StatTitle/StatValue)
+        f = ttk.Frame(self.grid_frame, style="StatCard.TFrame", padding=10)
         f.grid(row=r, column=c, sticky="nsew", padx=5, pady=5)
 
-        # Color bar on left
+        # Color bar on left (unique per card, so it stays a plain swatch)
         bar = tk.Frame(f, bg=accent, width=4)
         bar.pack(side=tk.LEFT, fill=tk.Y, padx=(0, 8))
 
         # Text
-        content = tk.Frame(f, bg="#F9F9F9")
+        content = ttk.Frame(f, style="StatCard.TFrame")
         content.pack(side=tk.LEFT, fill=tk.BOTH)
 
-        tk.Label(content, text=title, bg="#F9F9F9", fg="#7f8c8d", font=("Segoe UI", 8, "bold")).pack(anchor="w")
-        tk.Label(content, textvariable=variable, bg="#F9F9F9", fg="#2c3e50", font=("Segoe UI", 14, "bold")).pack(anchor="w")
+        ttk.Label(content, text=title, style="StatTitle.TLabel").pack(anchor="w")
+        ttk.Label(content, textvariable=variable, style="StatValue.TLabel").pack(anchor="w")
 
     def update_metrics(self, metrics_collector):
         data = metrics_collector.summary()
-        ratio = data.get("delivery_ratio", 0) * 100
-        latency = data.get("avg_latency", 0) * 1000
-        dupes = data.get("duplicates", 0)
-        energy = data.get("total_energy_j", 0)
-
-        self.metrics_labels["Delivery Ratio"].set(f"{ratio:.1f} %")
-        self.metrics_labels["Avg Latency"].set(f"{latency:.1f} ms")
-        self.metrics_labels["Duplicates"].set(str(dupes))
-        self.metrics_labels["Energy (J)"].set(f"{energy:.1f}")
\ No newline at end of file
+        get = data.get
+        ratio = get("delivery_ratio", 0) * 100
+        latency = get("avg_latency", 0) * 1000
+        dupes = get("duplicates", 0)
+        energy = get("total_energy_j", 0)
+
+        self._set("Delivery Ratio", f"{ratio:.1f} %")
+        self._set("Avg Latency", f"{latency:.1f} ms")
+        self._set("Duplicates", str(dupes))
+        self._set("Energy (J)", f"{energy:.1f}")
+
+    def _set(self, key, text):
+        if self._last[key] != text:
+            self.metrics_labels[key].set(text)
+            self._last[key] = text
\ No newline at end of file
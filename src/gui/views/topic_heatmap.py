@@ -1,37 +1,115 @@
 import tkinter as tk
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from matplotlib.figure import Figure
 import numpy as np
 
+from .plot_host import PlotHost
+
+# Topic sets up to this size are hand-drawn on a tk.Canvas from a fixed item pool
+CANVAS_TOPIC_LIMIT = 32
+# Larger sets fall back to matplotlib; disable to just truncate to the first CANVAS_TOPIC_LIMIT
+USE_MPL_FALLBACK = True
+
+
+def _bar_color(count, max_val):
+    # Blue -> Purple gradient
+    r, g, b = count / max_val * 0.5, 0.2, 0.8
+    return f"#{int(r * 255):02x}{int(g * 255):02x}{int(b * 255):02x}"
+
 
 class TopicHeatmap(tk.Frame):
     def __init__(self, parent):
         super().__init__(parent)
-        self.fig = Figure(figsize=(5, 3), dpi=80) # Lower DPI to fit sidebar
-        self.ax = self.fig.add_subplot(111)
-        self.fig.subplots_adjust(bottom=0.25, left=0.35, right=0.95, top=0.9) # Adjust margins
+        self.cv = tk.Canvas(self, height=240, bg='white', highlightthickness=0)
+        self.cv.pack(fill=tk.BOTH, expand=True)
+        self.plot_host = None  # Created on first overflow past CANVAS_TOPIC_LIMIT
 
-        self.canvas = FigureCanvasTkAgg(self.fig, master=self)
-        self.canvas.draw()
-        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        # Pre-built item pool; update_plot only moves/recolors these
+        self._rect_ids = [self.cv.create_rectangle(0, 0, 0, 0, fill='#cccccc', outline='', state='hidden')
+                          for _ in range(CANVAS_TOPIC_LIMIT)]
+        self._text_ids = [self.cv.create_text(0, 0, text="", anchor='e', fill='#2c3e50', font=("Segoe UI", 8),
+                                              state='hidden')
+                          for _ in range(CANVAS_TOPIC_LIMIT)]
+        self._empty_id = self.cv.create_text(0, 0, text="Waiting for Traffic...", fill='#95a5a6')
+        self._axis_id = self.cv.create_text(0, 0, text="", anchor='se', fill='#7f8c8d', font=("Segoe UI", 8))
+
+        self._shown = 0  # Pool slots currently visible
+        self._topic_counts = {}
+        self.cv.bind("<Configure>", lambda e: self._draw_canvas())
 
     def update_plot(self, topic_counts):
-        self.ax.clear()
+        self._topic_counts = topic_counts
+        if USE_MPL_FALLBACK and len(topic_counts) > CANVAS_TOPIC_LIMIT:
+            self._show_mpl()
+            self._draw_mpl(topic_counts)
+        else:
+            self._show_canvas()
+            self._draw_canvas()
+
+    # --- Canvas path (common case) ---
+    def _draw_canvas(self):
+        w, h = self.cv.winfo_width(), self.cv.winfo_height()
+        if w <= 1 or h <= 1:
+            return  # Not mapped yet; <Configure> will trigger the first draw
 
         # Handle Empty State
-        if not topic_counts:
-            self.ax.text(0.5, 0.5, "Waiting for Traffic...",
-                         ha='center', va='center', transform=self.ax.transAxes, color='#95a5a6')
-            self.ax.set_xticks([])
-            self.ax.set_yticks([])
-            self.canvas.draw()
+        if not self._topic_counts:
+            self._hide_from(0)
+            self.cv.coords(self._empty_id, w / 2, h / 2)
+            self.cv.itemconfigure(self._empty_id, state='normal')
+            self.cv.itemconfigure(self._axis_id, text="")
             return
+        self.cv.itemconfigure(self._empty_id, state='hidden')
+
+        items = list(self._topic_counts.items())[:CANVAS_TOPIC_LIMIT]
+        max_val = max(c for _, c in items) or 1
+
+        # Mirror the matplotlib margins: 35% label gutter, 5% right, 10% top, axis caption below
+        left, right = w * 0.35, w * 0.95
+        top, bottom = h * 0.1, h - 20
+        row_h = min(22.0, (bottom - top) / len(items))
+        bar_w = right - left
+
+        for i, (topic, count) in enumerate(items):
+            y0 = top + i * row_h
+            rid, tid = self._rect_ids[i], self._text_ids[i]
+            self.cv.coords(rid, left, y0 + 2, left + bar_w * count / max_val, y0 + row_h - 2)
+            self.cv.itemconfigure(rid, fill=_bar_color(count, max_val), state='normal')
+            self.cv.coords(tid, left - 4, y0 + row_h / 2)
+            self.cv.itemconfigure(tid, text=topic, state='normal')
+
+        self._hide_from(len(items))
+        self.cv.coords(self._axis_id, right, h - 4)
+        self.cv.itemconfigure(self._axis_id, text=f"max {max_val:.1f} Msg / Sec")
+
+    def _hide_from(self, start):
+        for i in range(start, self._shown):
+            self.cv.itemconfigure(self._rect_ids[i], state='hidden')
+            self.cv.itemconfigure(self._text_ids[i], state='hidden')
+        self._shown = start
+
+    def _show_canvas(self):
+        if self.plot_host is not None and self.plot_host.winfo_manager():
+            self.plot_host.pack_forget()
+            self.cv.pack(fill=tk.BOTH, expand=True)
+
+    # --- matplotlib path (many topics) ---
+    def _show_mpl(self):
+        if self.plot_host is None:
+            # Lower DPI to fit sidebar
+            self.plot_host = PlotHost(self, nrows=1, figsize=(5, 3), dpi=80,
+                                      bottom=0.25, left=0.35, right=0.95, top=0.9)
+        if not self.plot_host.winfo_manager():
+            self.cv.pack_forget()
+            self.plot_host.pack(fill=tk.BOTH, expand=True)
+
+    def _draw_mpl(self, topic_counts):
+        ax = self.plot_host.axes[0]
+        ax.clear()
 
         topics = list(topic_counts.keys())
         counts = list(topic_counts.values())
         y_pos = np.arange(len(topics))
 
-        bars = self.ax.barh(y_pos, counts, align='center', alpha=0.8)
+        bars = ax.barh(y_pos, counts, align='center', alpha=0.8)
 
         # Color based on volume
         max_val = max(counts) if max(counts) > 0 else 1
@@ -39,11 +117,11 @@ class TopicHeatmap(tk.Frame):
             # Blue -> Purple gradient
             bar.set_color((count/max_val * 0.5, 0.2, 0.8))
 
-        self.ax.set_yticks(y_pos)
-        self.ax.set_yticklabels(topics, fontsize=8)
-        self.ax.invert_yaxis()
-        self.ax.set_xlabel('Msg / Sec', fontsize=8)
-        self.ax.tick_params(axis='x', labelsize=8)
-        self.ax.grid(axis='x', linestyle='--', alpha=0.3)
+        ax.set_yticks(y_pos)
+        ax.set_yticklabels(topics, fontsize=8)
+        ax.invert_yaxis()
+        ax.set_xlabel('Msg / Sec', fontsize=8)
+        ax.tick_params(axis='x', labelsize=8)
+        ax.grid(axis='x', linestyle='--', alpha=0.3)
 
-        self.canvas.draw()
\ No newline at end of file
+        self.plot_host.refresh()
@@ -1,12 +1,52 @@
 import random
 import math
 import json
+from collections import Counter
+import numpy as np
 from .devices.sensor_node import SensorNode
 from .devices.gateway import Gateway
 from .mqtt.broker import MqttBroker
 from .mqtt.wan import WanLink
 from .mobility.random_waypoint import RandomWaypoint
 from .mobility.grid import GridMobility
+from .mobility.manager import MobilityManager
+
+# Palette/node-type labels the GUI styles individually; anything else renders as "Sensor"
+GUI_TYPES = {"Gateway", "Laptop", "iPhone", "Asset Tag", "Beacon", "Wearable",
+             "Ad-Hoc Relay", "Source Node", "Sink Node"}
+
+# Built-in scenarios: selection token -> (node_type, x, y, is_mobile) in creation order.
+# load_experiment picks the first token found in the (lower-cased) selection, default "e3".
+SCENARIOS = {
+    # Tighter spacing for Zigbee (Range ~30m)
+    "e1": [("Gateway", 250, 250, False),
+           ("Sensor", 250, 230, False),  # 20m dist
+           ("Sensor", 250, 210, False),
+           ("Sensor", 270, 250, False),
+           ("Sensor", 290, 250, False)],
+    "e2": [("Gateway", 250, 250, False),
+           ("Sensor", 280, 250, False),
+           ("Sensor", 320, 250, False),
+           ("Sensor", 400, 250, False)],
+    "e3": [("Gateway", 250, 250, False),
+           ("iPhone", 150, 250, True),
+           ("Laptop", 350, 250, False)],
+    "zigbee only": [("Gateway", 250, 250, False),
+                    ("Sensor", 250, 230, False),  # Close
+                    ("Sensor", 250, 210, False),  # Daisy chain
+                    ("Asset Tag", 230, 250, True)],
+    "wi-fi only": [("Gateway", 250, 250, False),
+                   ("Laptop", 280, 250, False),
+                   ("iPhone", 200, 200, True)],
+    "ble only": [("Gateway", 250, 250, False),
+                 ("Beacon", 230, 250, False),
+                 ("Beacon", 270, 250, False),
+                 ("Wearable", 250, 220, True)],
+    "ad-hoc": [("Source Node", 100, 250, False),
+               ("Ad-Hoc Relay", 150, 250, False),
+               ("Ad-Hoc Relay", 200, 250, False),
+               ("Sink Node", 250, 250, False)],
+}
 
 
 class WanBrokerProxy:
@@ -23,31 +63,56 @@ class WanBrokerProxy:
     def connect(self, client_id, client_instance, clean_session=True):
         return self.real_broker.connect(client_id, client_instance, clean_session)
 
-    def publish(self, sender_id, topic, payload, qos=0, retain=False):
-        return self.wan_link.send(self.real_broker.publish, sender_id, topic, payload, qos, retain)
+    def publish(self, sender_id, topic, payload, qos=0, retain=False, size=None):
+        # Generator like MqttBroker.publish, so callers wrap it in one env.process
+        # instead of a second WAN transmission process
+        yield self.wan_link.env.timeout(self.wan_link.sample_latency())
+        if self.wan_link.drop():
+            return None  # Lost on the WAN
+        return (yield from self.real_broker.publish(sender_id, topic, payload, qos, retain, size))
 
     def subscribe(self, client_id, topic):
         return self.real_broker.subscribe(client_id, topic)
 
 
 class ScenarioLoader:
-    def __init__(self, env, metrics):
+    def __init__(self, env, metrics, rng=None):
         self.env = env
         self.metrics = metrics
+        self.rng = rng  # SimulationEnvironment.rng, handed to nodes and the WAN link
         self.nodes = []
-        self.broker = MqttBroker(env, metrics)
-        self.wan_link = WanLink(env, latency_ms=(100, 300), loss_rate=0.01)
+        self._by_id = {}
+        # One GUI row per node (same order as self.nodes), refreshed in place every frame
+        self._gui_rows = []
+        self._row_by_id = {}  # node id -> its row in _gui_rows
+        # Node positions as struct-of-arrays for vectorized hit-testing (see get_gui_node_arrays)
+        self._X = np.zeros(64, np.float32)
+        self._Y = np.zeros(64, np.float32)
+        # Set whenever topology, connection state or positions change; clean frames only refresh battery
+        self._gui_dirty = True
+        self.broker = MqttBroker(env, metrics, rng=rng)
+        self.wan_link = WanLink(env, latency_ms=(100, 300), loss_rate=0.01, rng=rng)
         self.cloud_broker_proxy = WanBrokerProxy(self.broker, self.wan_link)
         self.gw_pos = (250, 250)
         self.active_protocol = "zigbee"
         self.next_ip_host = 10
         self.sink = SinkSubscriber(env, self.broker)
+        # One process steps every mobile node (see MobilityManager)
+        self.mobility = MobilityManager(env)
 
     def _get_network_nodes(self):
         return self.nodes
 
+    def mark_gui_dirty(self):
+        self._gui_dirty = True
+
     def load_experiment(self, selection_str="E3"):
         self.nodes = []
+        self.mobility.clear()
+        self._by_id = {}
+        self._gui_rows = []
+        self._row_by_id = {}
+        self._gui_dirty = True
         sel = selection_str.lower()
         self.gw_pos = (250, 250)
         self.next_ip_host = 10
@@ -59,64 +124,9 @@ class ScenarioLoader:
         else:
             self.active_protocol = "zigbee"
 
-        if "e1" in sel:
-            self._setup_e1_duty_cycle()
-        elif "e2" in sel:
-            self._setup_e2_comparison()
-        elif "e3" in sel:
-            self._setup_e3_failover()
-        elif "zigbee only" in sel:
-            self._setup_zigbee_industrial()
-        elif "wi-fi only" in sel:
-            self._setup_wifi_office()
-        elif "ble only" in sel:
-            self._setup_ble_tracking()
-        elif "ad-hoc" in sel:
-            self._setup_adhoc_mesh()
-        else:
-            self._setup_e3_failover()
-
-    def _setup_e1_duty_cycle(self):
-        # Tighter spacing for Zigbee (Range ~30m)
-        self.add_dynamic_node("Gateway", 250, 250)
-        self.add_dynamic_node("Sensor", 250, 230)  # 20m dist
-        self.add_dynamic_node("Sensor", 250, 210)
-        self.add_dynamic_node("Sensor", 270, 250)
-        self.add_dynamic_node("Sensor", 290, 250)
-
-    def _setup_e2_comparison(self):
-        self.add_dynamic_node("Gateway", 250, 250)
-        self.add_dynamic_node("Sensor", 280, 250)
-        self.add_dynamic_node("Sensor", 320, 250)
-        self.add_dynamic_node("Sensor", 400, 250)
-
-    def _setup_e3_failover(self):
-        self.add_dynamic_node("Gateway", 250, 250)
-        self.add_dynamic_node("iPhone", 150, 250, is_mobile=True)
-        self.add_dynamic_node("Laptop", 350, 250)
-
-    def _setup_zigbee_industrial(self):
-        self.add_dynamic_node("Gateway", 250, 250)
-        self.add_dynamic_node("Sensor", 250, 230)  # Close
-        self.add_dynamic_node("Sensor", 250, 210)  # Daisy chain
-        self.add_dynamic_node("Asset Tag", 230, 250, is_mobile=True)
-
-    def _setup_wifi_office(self):
-        self.add_dynamic_node("Gateway", 250, 250)
-        self.add_dynamic_node("Laptop", 280, 250)
-        self.add_dynamic_node("iPhone", 200, 200, is_mobile=True)
-
-    def _setup_ble_tracking(self):
-        self.add_dynamic_node("Gateway", 250, 250)
-        self.add_dynamic_node("Beacon", 230, 250)
-        self.add_dynamic_node("Beacon", 270, 250)
-        self.add_dynamic_node("Wearable", 250, 220, is_mobile=True)
-
-    def _setup_adhoc_mesh(self):
-        self.add_dynamic_node("Source Node", 100, 250)
-        self.add_dynamic_node("Ad-Hoc Relay", 150, 250)
-        self.add_dynamic_node("Ad-Hoc Relay", 200, 250)
-        self.add_dynamic_node("Sink Node", 250, 250)
+        key = next((token for token in SCENARIOS if token in sel), "e3")
+        for node_type, x, y, is_mobile in SCENARIOS[key]:
+            self.add_dynamic_node(node_type, x, y, is_mobile=is_mobile)
 
     def _alloc_ip(self):
         ip = f"10.0.0.{self.next_ip_host}"
@@ -129,6 +139,11 @@ class ScenarioLoader:
             data = json.load(f)
 
         self.nodes = []
+        self.mobility.clear()
+        self._by_id = {}
+        self._gui_rows = []
+        self._row_by_id = {}
+        self._gui_dirty = True
         self.active_protocol = data.get("protocol", self.active_protocol)
         self.gw_pos = tuple(data.get("gateway_position", self.gw_pos))
         self.next_ip_host = 10
@@ -157,110 +172,153 @@ class ScenarioLoader:
             except Exception:
                 pass
             # Parent link if present
-            if hasattr(node, "connected_parent_id"):
-                node.connected_parent_id = n.get("parent_id")
+            node.connected_parent_id = n.get("parent_id")
 
     def add_dynamic_node(self, node_type, x, y, is_mobile=False, ip=None):
         clean_type = node_type.replace("Add ", "").split()[0]
         if clean_type in ["iPhone", "Mobile", "Wearable", "Asset Tag"]:
             is_mobile = True
 
-        new_id = f"{clean_type[:4]}_{random.randint(100, 999)}"
+        new_id = f"{clean_type[:4]}_{(self.rng or random).randint(100, 999)}"
+        # ids key the index, so they must be unique; count past 999 once the random range is crowded
+        suffix = 1000
+        while new_id in self._by_id:
+            new_id = f"{clean_type[:4]}_{suffix}"
+            suffix += 1
         radio = self.active_protocol
         ip_addr = ip or self._alloc_ip()
 
         if "Gateway" in clean_type:
-            node = Gateway(self.env, new_id, (x, y), self.cloud_broker_proxy, self._get_network_nodes)
+            node = Gateway(self.env, new_id, (x, y), self.cloud_broker_proxy, self._get_network_nodes,
+                           rng=self.rng)
             self.gw_pos = (x, y)
             node.is_gateway = True
         else:
-            node = SensorNode(self.env, new_id, (x, y), radio, self.broker, self._get_network_nodes)
+            node = SensorNode(self.env, new_id, (x, y), radio, self.broker, self._get_network_nodes,
+                              rng=self.rng)
+            label = node_type.replace("Add ", "").strip()
+            if label in GUI_TYPES:
+                node.gui_type = label
 
         node.ip = ip_addr
+        node.on_change = self.mark_gui_dirty
 
         if is_mobile:
             node.is_mobile = True
-            GridMobility(self.env, node, bounds=(0, 500))
+            GridMobility(self.env, node, bounds=(0, 500), manager=self.mobility, rng=self.rng)
 
         self.nodes.append(node)
+        self._by_id[new_id] = node
+        self._gui_dirty = True
+        self._gui_rows.append({
+            "id": new_id, "x": x, "y": y, "type": node.gui_type, "state": node.state,
+            "battery": 100, "protocol": self.active_protocol,
+            "mqtt_connected": False,
+            "parent_id": None,
+            "retries": 0,
+            "next_retry": 0.0,
+            "ip": ip_addr,
+        })
+        self._row_by_id[new_id] = self._gui_rows[-1]
+        self._invalidate_links()
         return node
 
     def remove_node(self, node_id):
-        for n in list(self.nodes):
-            if n.id == node_id:
-                n.stop()
-                self.nodes.remove(n)
-                break
+        node = self._by_id.pop(node_id, None)
+        if node is None:
+            return
+        node.stop()
+        self.mobility.remove(node)
+        i = self.nodes.index(node)
+        del self.nodes[i]
+        del self._gui_rows[i]
+        del self._row_by_id[node_id]
+        self._gui_dirty = True
+        self._invalidate_links()
+
+    def _invalidate_links(self):
+        # A node joined or left: cached parent choices may point at it (or miss it)
+        for n in self.nodes:
+            n.invalidate_link_cache()
 
     def get_node(self, node_id):
-        return next((n for n in self.nodes if n.id == node_id), None)
+        return self._by_id.get(node_id)
 
-    def get_gui_node_data(self):
-        data = []
-        parent_map = {}
-        for n in self.nodes:
-            if hasattr(n, 'connected_parent_id') and n.connected_parent_id:
-                p = n.connected_parent_id
-                parent_map[p] = parent_map.get(p, 0) + 1
+    def get_gui_row(self, node_id):
+        """The get_gui_node_data() row for node_id (as of the last refresh), or None."""
+        return self._row_by_id.get(node_id)
 
-        for n in self.nodes:
-            ntype = "Sensor"
-            if getattr(n, "is_gateway", False) or "Gateway" in n.id:
-                ntype = "Gateway"
-            elif "Laptop" in n.id:
-                ntype = "Laptop"
-            elif "iPhone" in n.id:
-                ntype = "iPhone"
-            elif "Asset" in n.id:
-                ntype = "Asset Tag"
-            elif "Beacon" in n.id:
-                ntype = "Beacon"
-            elif "Wearable" in n.id:
-                ntype = "Wearable"
-            elif "Relay" in n.id:
-                ntype = "Ad-Hoc Relay"
-            elif "Source" in n.id:
-                ntype = "Source Node"
-            elif "Sink" in n.id:
-                ntype = "Sink Node"
-
-            connected = False
-            parent = None
-            retries = 0
-            next_retry = 0.0
-
-            if hasattr(n, "mqtt"):
-                connected = n.mqtt.connected
-                parent = n.connected_parent_id
-                # <--- EXTRACT STATS --->
-                if not connected:
-                    retries = getattr(n.mqtt, 'retry_count', 0)
-                    next_retry = getattr(n.mqtt, 'backoff', 0.0)
+    def get_gui_node_data(self):
+        """Per-node rows for the GUI/exporter.
+
+        Rows are reused across calls and mutated in place, so callers that
+        keep a reference see the next refresh. Every node is a SensorNode
+        (Gateway included), so ``mqtt`` and ``connected_parent_id`` always exist.
+        Unless something called mark_gui_dirty() since the last call, only the
+        battery fields are refreshed.
+        """
+        if not self._gui_dirty:
+            for n, row in zip(self.nodes, self._gui_rows):
+                row["battery"] = _battery(n.battery_j)
+            return self._gui_rows
+        self._gui_dirty = False
+
+        parent_map = Counter(n.connected_parent_id for n in self.nodes if n.connected_parent_id)
+
+        for n, row in zip(self.nodes, self._gui_rows):
+            ntype = n.gui_type
+            mqtt = n.mqtt
+            connected = mqtt.connected
+            state = n.state
+            # <--- EXTRACT STATS --->
+            if connected:
+                retries, next_retry = 0, 0.0
+            else:
+                retries, next_retry = mqtt.retry_count, mqtt.backoff
 
             # Color Logic:
-            visual_state = n.state
+            visual_state = state
             if ntype == "Gateway":
-                visual_state = "active" if parent_map.get(n.id, 0) > 0 else "scanning"
+                visual_state = "active" if parent_map[n.id] > 0 else "scanning"
             else:
-                if connected and n.state != "dead":
+                if connected and state != "dead":
                     visual_state = "active"
-                elif not connected and n.state == "active":
+                elif not connected and state == "active":
                     visual_state = "scanning"
 
-            batt = 100
-            if n.battery_j != float('inf'):
-                batt = int(max(0, (n.battery_j / 1000.0) * 100))
-
-            data.append({
-                "id": n.id, "x": n.x, "y": n.y, "type": ntype, "state": visual_state,
-                "battery": batt, "protocol": self.active_protocol,
-                "mqtt_connected": connected,
-                "parent_id": parent,
-                "retries": retries,
-                "next_retry": next_retry,
-                "ip": getattr(n, "ip", "n/a"),
-            })
-        return data
+            row["x"] = n.x
+            row["y"] = n.y
+            row["battery"] = _battery(n.battery_j)
+            row["state"] = visual_state
+            row["mqtt_connected"] = connected
+            row["parent_id"] = n.connected_parent_id
+            row["retries"] = retries
+            row["next_retry"] = next_retry
+
+        # Mirror positions into the SoA buffers in one slice write each
+        count = len(self.nodes)
+        if count > len(self._X):
+            cap = max(count, 2 * len(self._X))
+            self._X, self._Y = np.zeros(cap, np.float32), np.zeros(cap, np.float32)
+        self._X[:count] = [n.x for n in self.nodes]
+        self._Y[:count] = [n.y for n in self.nodes]
+        return self._gui_rows
+
+    def get_gui_node_arrays(self):
+        """Node positions as NumPy arrays, in the same order as get_gui_node_data().
+
+        Values are as of the last get_gui_node_data() call; the arrays are
+        views into buffers that the next refresh overwrites.
+        """
+        n = len(self.nodes)
+        return {"x": self._X[:n], "y": self._Y[:n]}
+
+
+def _battery(battery_j):
+    """GUI battery % assuming 100% = 1000 J; mains power reads as full."""
+    if battery_j == float('inf'):
+        return 100
+    return int(max(0, (battery_j / 1000.0) * 100))
 
 
 class SinkSubscriber:
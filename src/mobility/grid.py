@@ -1,57 +1,72 @@
 """Grid movement model for slowly roaming clients (e.g., along hallways)."""
 
 import random
-import math
+
+from ..utils.random_helpers import UniformPool
 
 class GridMobility:
-    def __init__(self, env, node, bounds=(0, 200), speed=(0.5, 1.5), grid_step=20):
+    def __init__(self, env, node, bounds=(0, 200), speed=(0.5, 1.5), grid_step=20, manager=None, rng=None):
         self.env = env
         self.node = node
+        self.rng = rng or random  # Seeded simulation RNG (defaults to the global random module)
         self.bounds = bounds
         self.speed_range = speed
         self.grid_step = grid_step  # Distance between "hallways"
+        self._max_step = int(bounds[1] / grid_step)
+        self._grid_candidates = [i * grid_step for i in range(self._max_step + 1)]
+        self._speed = UniformPool(*speed, size=256, rng=rng)
+        self._short_pause = UniformPool(1.0, 3.0, size=256, rng=rng)  # At the hallway intersection
+        self._long_pause = UniformPool(5.0, 15.0, size=256, rng=rng)  # At the destination
 
         # Snap starting position to nearest grid intersection
         self.node.x = round(self.node.x / grid_step) * grid_step
         self.node.y = round(self.node.y / grid_step) * grid_step
 
-        self.env.process(self.move_process())
+        # With a MobilityManager the node only supplies legs; otherwise it runs its own process
+        if manager is not None:
+            manager.add(node, self.legs())
+        else:
+            self.env.process(self.move_process())
+
+    def legs(self):
+        """Same route as move_process, as (x, y, speed, pause) legs for MobilityManager."""
+        while True:
+            target_x = self.rng.choice(self._grid_candidates)
+            target_y = self.rng.choice(self._grid_candidates)
+
+            # X-axis hallway, short pause at the intersection, then the Y-axis hallway
+            yield target_x, self.node.y, self._speed(), self._short_pause()
+            yield target_x, target_y, self._speed(), self._long_pause()
 
     def move_process(self):
         while True:
             # 1. Pick a random intersection on the grid
-            max_step = int(self.bounds[1] / self.grid_step)
-            target_x = random.randint(0, max_step) * self.grid_step
-            target_y = random.randint(0, max_step) * self.grid_step
+            target_x = self.rng.choice(self._grid_candidates)
+            target_y = self.rng.choice(self._grid_candidates)
 
             # 2. Move along X-axis first (Hallway A)
             if self.node.x != target_x:
                 yield self.env.process(self._move_to(target_x, self.node.y))
 
             # 3. Pause briefly at intersection
-            yield self.env.timeout(random.uniform(1.0, 3.0))
+            yield self.env.timeout(self._short_pause())
 
             # 4. Move along Y-axis (Hallway B)
             if self.node.y != target_y:
                 yield self.env.process(self._move_to(self.node.x, target_y))
 
             # 5. Wait at destination
-            yield self.env.timeout(random.uniform(5.0, 15.0))
+            yield self.env.timeout(self._long_pause())
 
     def _move_to(self, dest_x, dest_y):
+        # Callers only move along one hallway at a time and skip zero-length moves,
+        # so the distance is simply |dx| + |dy|
         dx = dest_x - self.node.x
         dy = dest_y - self.node.y
-        dist = math.hypot(dx, dy)
-
-        if dist == 0:
-            return
-
-        speed = random.uniform(*self.speed_range)
-        duration = dist / speed
+        dist = abs(dx) + abs(dy)
 
         # Animate movement in 1-second chunks
-        steps = int(duration)
-        if steps < 1: steps = 1
+        steps = max(1, int(dist / self._speed()))
 
         step_x = dx / steps
         step_y = dy / steps
@@ -59,8 +74,10 @@ class GridMobility:
         for _ in range(steps):
             self.node.x += step_x
             self.node.y += step_y
+            self.node.mark_dirty()
             yield self.env.timeout(1.0)
 
         # Ensure final position is exact
         self.node.x = dest_x
-        self.node.y = dest_y
\ No newline at end of file
+        self.node.y = dest_y
+        self.node.mark_dirty()
\ No newline at end of file
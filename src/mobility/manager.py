@@ -0,0 +1,124 @@
+"""Vectorized mobility engine: one SimPy process advances every mobile node.
+
+Mobility models (grid, random waypoint) only decide *where* a node goes next
+as a stream of legs ``(target_x, target_y, speed, pause_after)``. The manager
+keeps positions, targets, speeds and pause deadlines as NumPy arrays indexed
+by slot and steps all of them once per tick, so Python code only runs when a
+node finishes a leg.
+"""
+
+import numpy as np
+
+
+def _grown(arr, cap):
+    out = np.zeros((cap,) + arr.shape[1:], arr.dtype)
+    out[:len(arr)] = arr
+    return out
+
+
+class MobilityManager:
+    def __init__(self, env, tick=1.0, capacity=16):
+        self.env = env
+        self.tick = tick
+
+        self.pos = np.zeros((capacity, 2))
+        self.target = np.zeros((capacity, 2))
+        self.speed = np.zeros(capacity)
+        self.pause_until = np.zeros(capacity)
+        self.pause_after = np.zeros(capacity)
+
+        self._nodes = []     # slot -> node
+        self._legs = []      # slot -> leg iterator
+        self._slot_of = {}   # node -> slot
+
+        self.env.process(self._run())
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def add(self, node, legs):
+        """Start moving ``node`` along the legs produced by the ``legs`` iterator."""
+        slot = len(self._nodes)
+        if slot == len(self.speed):
+            cap = 2 * slot
+            self.pos, self.target = _grown(self.pos, cap), _grown(self.target, cap)
+            self.speed, self.pause_until = _grown(self.speed, cap), _grown(self.pause_until, cap)
+            self.pause_after = _grown(self.pause_after, cap)
+
+        self._nodes.append(node)
+        self._legs.append(legs)
+        self._slot_of[node] = slot
+        self.pos[slot] = (node.x, node.y)
+        self.pause_until[slot] = self.env.now
+        self._next_leg(slot)
+
+    def remove(self, node):
+        """Stop moving ``node``; the last slot is swapped into its place."""
+        slot = self._slot_of.pop(node, None)
+        if slot is None:
+            return
+        last = len(self._nodes) - 1
+        if slot != last:
+            moved = self._nodes[last]
+            self._nodes[slot], self._legs[slot] = moved, self._legs[last]
+            for arr in (self.pos, self.target, self.speed, self.pause_until, self.pause_after):
+                arr[slot] = arr[last]
+            self._slot_of[moved] = slot
+        self._nodes.pop()
+        self._legs.pop()
+
+    def clear(self):
+        self._nodes, self._legs, self._slot_of = [], [], {}
+
+    def relocate(self, node):
+        """Re-read a node's x/y after an external move (e.g. a GUI drag)."""
+        slot = self._slot_of.get(node)
+        if slot is not None:
+            self.pos[slot] = (node.x, node.y)
+
+    def _next_leg(self, slot):
+        try:
+            tx, ty, speed, pause = next(self._legs[slot])
+        except StopIteration:
+            # Model ran out of legs: park the node where it is
+            self.target[slot] = self.pos[slot]
+            self.pause_until[slot] = np.inf
+            return
+        self.target[slot] = (tx, ty)
+        self.speed[slot] = speed
+        self.pause_after[slot] = pause
+
+    def _run(self):
+        while True:
+            yield self.env.timeout(self.tick)
+            n = len(self._nodes)
+            if not n:
+                continue
+
+            now = self.env.now
+            pos, target = self.pos[:n], self.target[:n]
+            moving = self.pause_until[:n] <= now
+            if not moving.any():
+                continue
+
+            delta = target - pos
+            dist = np.hypot(delta[:, 0], delta[:, 1])
+            step = self.speed[:n] * self.tick
+            arrived = moving & (dist <= step)
+            cruising = moving & ~arrived
+
+            if cruising.any():
+                pos[cruising] += delta[cruising] * (step[cruising] / dist[cruising])[:, None]
+            pos[arrived] = target[arrived]
+
+            nodes = self._nodes
+            for i in np.flatnonzero(moving):
+                node = nodes[i]
+                node.x = float(pos[i, 0])
+                node.y = float(pos[i, 1])
+                node.mark_dirty()
+
+            # Arrivals wait out their pause, then head for the next leg
+            for i in np.flatnonzero(arrived):
+                self.pause_until[i] = now + self.pause_after[i]
+                self._next_leg(i)
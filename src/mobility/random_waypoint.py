@@ -1,42 +1,45 @@
 """Random-waypoint mobility generator for general roaming behavior."""
 
-import random
 import math
 
+from ..utils.random_helpers import UniformPool
+
 
 class RandomWaypoint:
-    def __init__(self, env, node, bounds=(0, 200), speed=(0.5, 2.0)):
+    def __init__(self, env, node, bounds=(0, 200), speed=(0.5, 2.0), manager=None, rng=None):
         self.env = env
         self.node = node
         self.bounds = bounds
         self.speed_range = speed
         self.target = None
+        self._speed = UniformPool(*speed, size=256, rng=rng)
+        self._pause = UniformPool(1, 5, size=256, rng=rng)
+        self._coord = UniformPool(*bounds, size=256, rng=rng)  # Waypoint x/y draws
 
-        self.env.process(self.move_process())
+        if manager is not None:
+            manager.add(node, self.legs())
+        else:
+            self.env.process(self.move_process())
 
-    def move_process(self):
+    def legs(self):
+        """Waypoints as (x, y, speed, pause) legs for MobilityManager."""
         while True:
-            # Pick a target
-            target_x = random.uniform(*self.bounds)
-            target_y = random.uniform(*self.bounds)
-
-            dx = target_x - self.node.x
-            dy = target_y - self.node.y
-            dist = math.hypot(dx, dy)
+            self.target = (self._coord(), self._coord())
+            yield self.target[0], self.target[1], self._speed(), self._pause()
 
-            speed = random.uniform(*self.speed_range)
-            duration = dist / speed
-
-            steps = int(duration)
-            if steps < 1:
-                steps = 1
+    def move_process(self):
+        """Standalone path: jump to each waypoint once the travel time has elapsed.
 
-            step_x = dx / steps
-            step_y = dy / steps
+        Intermediate positions are not animated here; nodes that should glide
+        across the map are driven by MobilityManager instead (see legs()).
+        """
+        while True:
+            self.target = target_x, target_y = self._coord(), self._coord()
+            dist = math.hypot(target_x - self.node.x, target_y - self.node.y)
 
-            for _ in range(steps):
-                self.node.x += step_x
-                self.node.y += step_y
-                yield self.env.timeout(1.0)  # Update every second
+            yield self.env.timeout(max(1.0, dist / self._speed()))
+            self.node.x = target_x
+            self.node.y = target_y
+            self.node.mark_dirty()
 
-            yield self.env.timeout(random.uniform(1, 5))  # Pause at waypoint
+            yield self.env.timeout(self._pause())  # Pause at waypoint
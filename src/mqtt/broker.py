@@ -1,17 +1,46 @@
-import simpy
-import random
+import re
+
+from ..utils.random_helpers import UniformPool
+
+# Period of the broker's shared keep-alive sweep; pings go out at most this late
+KEEPALIVE_TICK = 1.0
+
+
+def payload_size(payload):
+    """Approximate on-air payload size in bytes; computed once per message."""
+    if isinstance(payload, (bytes, str)):
+        return len(payload)
+    return len(repr(payload))
+
+
+def compile_filter(sub_filter):
+    """Compile an MQTT topic filter to a regex ('+' = one level, trailing '#' = rest of the topic)."""
+    levels = sub_filter.split("/")
+    multi = levels[-1] == "#"
+    if multi:
+        levels = levels[:-1]
+    pattern = "/".join("[^/]*" if level == "+" else re.escape(level) for level in levels)
+    if multi:
+        # "a/#" also matches the parent level "a"
+        pattern = f"{pattern}(/.*)?" if levels else ".*"
+    return re.compile(pattern)
 
 
 class MqttBroker:
-    def __init__(self, env, metrics_collector):
+    def __init__(self, env, metrics_collector, rng=None):
         self.env = env
         self.metrics = metrics_collector
         self.is_alive = True
         self.last_failover_start = None
         self.last_failover_end = None
 
-        # Map: topic_filter -> list of client_ids
-        self.subscriptions = {}
+        # Reverse subscription index: exact topic -> client_ids, plus everyone subscribed to "#"
+        self.exact_subs = {}
+        self.wildcard_subs = set()
+        # Other wildcard filters ("+", "a/#"): filter -> client_ids, matched via _sub_re
+        self.pattern_subs = {}
+        # Compiled regex per wildcard filter, built once at subscribe time
+        self._sub_re = {}
         # Map: topic -> payload (Last Retained)
         self.retained = {}
         # Map: client_id -> queue of messages (Persistent sessions)
@@ -19,73 +48,125 @@ class MqttBroker:
 
         # Clients currently online: client_id -> client_instance
         self.connected_clients = {}
+        # client_id -> client.check_keep_alive, polled by the one keep-alive sweep
+        self._keepalive_checks = {}
+
+        # Pre-drawn latency samples: ACK/delivery (10-50 ms) and PINGRESP (5-10 ms),
+        # seeded from the simulation RNG when one is given
+        self._ack_latency = UniformPool(0.01, 0.05, rng=rng)
+        self._ping_latency = UniformPool(0.005, 0.01, rng=rng)
+
+        # Monotonic publish counter used to build unique message ids
+        self._msg_seq = 0
+
+        self.env.process(self._keepalive_loop())
 
     def failover_sequence(self, downtime_s):
         """Simulate a crash and reboot."""
         self.is_alive = False
-        self.last_failover_start = float(self.env.now)
-        print(f"[{self.env.now:.2f}] !!! BROKER CRASH !!!")
+        now = self.env.now
+        self.last_failover_start = float(now)
+        print(f"[{now:.2f}] !!! BROKER CRASH !!!")
 
         # NEW: Force disconnect everyone (Simulate TCP Reset)
         # This forces clients to notice the failure and start retrying
         for client in self.connected_clients.values():
             client.connected = False
+            wake = getattr(client, "wake", None)  # Idle clients notice the reset right away
+            if wake is not None:
+                wake()
+            node = getattr(client, "node", None)  # Cloud sink has no device behind it
+            if node is not None:
+                node.mark_dirty()
 
         # Clear the broker's own list
         self.connected_clients = {}
+        self._keepalive_checks = {}
 
         yield self.env.timeout(downtime_s)
         self.is_alive = True
-        self.last_failover_end = float(self.env.now)
-        print(f"[{self.env.now:.2f}] ... BROKER RECOVERED ...")
+        now = self.env.now
+        self.last_failover_end = float(now)
+        print(f"[{now:.2f}] ... BROKER RECOVERED ...")
 
     def connect(self, client_id, client_instance, clean_session=True):
         if not self.is_alive:
             return False
 
         # ACK Latency
-        yield self.env.timeout(random.uniform(0.01, 0.05))
+        yield self.env.timeout(self._ack_latency())
 
         self.connected_clients[client_id] = client_instance
+        check = getattr(client_instance, "check_keep_alive", None)  # Cloud sink never pings
+        if check is not None:
+            self._keepalive_checks[client_id] = check
 
         # SESSION MANAGEMENT
         if clean_session:
             # Wipe any previous state
             self.client_queues[client_id] = []
         else:
-            # Persistent Session: Restore queue if it exists
-            if client_id not in self.client_queues:
-                self.client_queues[client_id] = []
+            # Persistent Session: take over the stored queue (if any) and leave a fresh one
+            queue = self.client_queues.get(client_id)
+            self.client_queues[client_id] = []
 
             # Deliver all queued messages immediately
-            queue_len = len(self.client_queues[client_id])
-            if queue_len > 0:
-                print(f"[{self.env.now:.2f}] Broker delivering {queue_len} offline msgs to {client_id}")
-                for msg in list(self.client_queues[client_id]):
-                    self.env.process(self._deliver_msg(client_id, msg))
-                self.client_queues[client_id] = []
+            if queue:
+                print(f"[{self.env.now:.2f}] Broker delivering {len(queue)} offline msgs to {client_id}")
+                for msg in queue:
+                    self._enqueue(client_id, msg)
 
         return True
 
+    def _keepalive_loop(self):
+        """One sweep per KEEPALIVE_TICK tells idle clients to ping, instead of a timer per client."""
+        while True:
+            yield self.env.timeout(KEEPALIVE_TICK)
+            if not self.is_alive:
+                continue
+            now = self.env.now
+            for check in self._keepalive_checks.values():
+                check(now)
+
     def ping(self, client_id):
         """Handle PINGREQ from client."""
+        delay, ok = self.ping_sync(client_id)
+        if delay:
+            yield self.env.timeout(delay)
+        return ok
+
+    def ping_sync(self, client_id):
+        """ping() without the SimPy process: returns (response delay, ok) for the caller to wait out."""
         if not self.is_alive:
-            return False
+            return 0.0, False
         # PINGRESP is just an ACK
-        yield self.env.timeout(random.uniform(0.005, 0.01))
-        return True
+        return self._ping_latency(), True
+
+    def publish(self, sender_id, topic, payload, qos=0, retain=False, size=None):
+        delay, ack = self.publish_sync(sender_id, topic, payload, qos, retain, size)
+        if delay:
+            yield self.env.timeout(delay)
+        return ack
+
+    def publish_sync(self, sender_id, topic, payload, qos=0, retain=False, size=None):
+        """publish() without the SimPy process.
 
-    def publish(self, sender_id, topic, payload, qos=0, retain=False):
+        Fan-out happens immediately; returns (ACK delay, ack) for the caller to
+        wait out: (0, False) if the broker is down, (0, None) for QoS 0.
+        """
         if not self.is_alive:
-            return False
+            return 0.0, False
 
         # 1. Record Publish Metric
-        msg_id = f"{sender_id}_{self.env.now}_{random.randint(0, 9999)}"
+        msg_id = f"{sender_id}:{self._msg_seq}"
+        self._msg_seq += 1
+        if size is None:
+            size = payload_size(payload)
         self.metrics.record_publish(
             msg_id,
             topic=topic,
             qos=qos,
-            size_bytes=len(str(payload)),
+            size_bytes=size,
             publisher_id=sender_id,
             timestamp=self.env.now,
         )
@@ -94,18 +175,18 @@ class MqttBroker:
             self.retained[topic] = payload
 
         # 2. Find Subscribers (With Wildcard Support)
-        matched_clients = set()
-        for sub_filter, client_ids in self.subscriptions.items():
-            if self._topic_matches(sub_filter, topic):
-                for cid in client_ids:
-                    matched_clients.add(cid)
-
-        # 3. Distribute
+        exact = self.exact_subs.get(topic)
+        matched_clients = self.wildcard_subs | exact if exact else self.wildcard_subs
+        for sub_filter, subs in self.pattern_subs.items():
+            if self._sub_re[sub_filter].fullmatch(topic):
+                matched_clients = matched_clients | subs
+
+        # 3. Distribute (one read-only message dict shared by all subscribers)
+        if matched_clients:
+            msg = {"topic": topic, "payload": payload, "qos": qos, "id": msg_id, "size": size}
         for sub_id in matched_clients:
-            msg = {"topic": topic, "payload": payload, "qos": qos, "id": msg_id}
-
             if sub_id in self.connected_clients:
-                self.env.process(self._deliver_msg(sub_id, msg))
+                self._enqueue(sub_id, msg)
             else:
                 # OFFLINE HANDLING
                 if sub_id not in self.client_queues:
@@ -114,44 +195,50 @@ class MqttBroker:
 
         # 4. ACK
         if qos > 0:
-            yield self.env.timeout(random.uniform(0.01, 0.05))
-            return True
-        return None
+            return self._ack_latency(), True
+        return 0.0, None
 
     def subscribe(self, client_id, topic):
         if not self.is_alive:
             return False
 
-        if topic not in self.subscriptions:
-            self.subscriptions[topic] = []
-        if client_id not in self.subscriptions[topic]:
-            self.subscriptions[topic].append(client_id)
-
-        # Check retained
-        for ret_topic, payload in self.retained.items():
-            if self._topic_matches(topic, ret_topic):
-                msg = {
-                    "topic": ret_topic,
-                    "payload": payload,
-                    "qos": 0,
-                    "id": f"ret_{self.env.now}",
-                }
-                self.env.process(self._deliver_msg(client_id, msg))
-
-    def _deliver_msg(self, client_id, msg):
-        yield self.env.timeout(random.uniform(0.01, 0.05))
+        if topic == "#":
+            self.wildcard_subs.add(client_id)
+            retained = self.retained.items()
+        elif "+" in topic or "#" in topic:
+            regex = self._sub_re.get(topic)
+            if regex is None:
+                regex = self._sub_re[topic] = compile_filter(topic)
+            self.pattern_subs.setdefault(topic, set()).add(client_id)
+            retained = [(t, p) for t, p in self.retained.items() if regex.fullmatch(t)]
+        else:
+            self.exact_subs.setdefault(topic, set()).add(client_id)
+            retained = [(topic, self.retained[topic])] if topic in self.retained else ()
+
+        # Replay retained messages matching the new filter
+        if retained:
+            ret_id = f"ret_{self.env.now}"
+            for ret_topic, payload in retained:
+                msg = {"topic": ret_topic, "payload": payload, "qos": 0, "id": ret_id,
+                       "size": payload_size(payload)}
+                self._enqueue(client_id, msg)
+
+    def _enqueue(self, client_id, msg):
+        """Deliver msg after the usual 10-50 ms broker latency.
+
+        Each delivery is a bare timeout with a callback (no Process), so a short
+        latency never waits behind an earlier message's longer one.
+        """
+        timeout = self.env.timeout(self._ack_latency())
+        timeout.callbacks.append(lambda _event: self._deliver(client_id, msg))
+
+    def _deliver(self, client_id, msg):
         # Verify client is still connected before sending
-        if client_id in self.connected_clients:
-            self.connected_clients[client_id].on_message(msg)
-            # CRITICAL: This updates the metrics!
-            self.metrics.record_delivery(
-                msg["id"], subscriber_id=client_id, timestamp=self.env.now
-            )
-
-    def _topic_matches(self, sub_filter, topic):
-        """Basic MQTT wildcard matching."""
-        if sub_filter == "#":
-            return True
-        if sub_filter == topic:
-            return True
-        return False
\ No newline at end of file
+        client = self.connected_clients.get(client_id)
+        if client is None:
+            return
+        client.on_message(msg)
+        # CRITICAL: This updates the metrics!
+        self.metrics.record_delivery(
+            msg["id"], subscriber_id=client_id, timestamp=self.env.now
+        )
@@ -1,8 +1,35 @@
 import simpy
 import random
+from collections import deque
+from typing import Any, NamedTuple
+
+from .broker import payload_size
+
+# Outgoing backlog cap; while the broker is down the oldest queued publishes are dropped
+MSG_QUEUE_LIMIT = 1000
+
+
+class Msg(NamedTuple):
+    """A queued outgoing publish; size is the payload's wire size, computed once."""
+    topic: str
+    payload: Any
+    qos: int
+    size: int
 
 
 class MqttClient:
+    # Exponential backoff steps in seconds; --- MAX CAP SET TO 10 SECONDS ---
+    _BACKOFF_TABLE = tuple(min(2.0 ** i, 10.0) for i in range(5))
+
+    # Fleets run thousands of clients; no per-instance __dict__
+    __slots__ = (
+        "env", "client_id", "broker", "radio", "node", "clean_session",
+        "connected", "_bo_idx", "retry_count", "msg_queue", "max_batch", "max_batch_bytes",
+        "keep_alive", "last_packet_time", "_ping_due", "_wakeup", "_rng",
+        "_tx_p_mw", "_rx_p_mw", "_consume", "_rx_j_per_byte", "_rx_j_fixed",
+        "_get_link", "_publish_sync", "_ping_sync", "_broker_ping",
+    )
+
     def __init__(self, env, client_id, broker, radio, parent_node, clean_session=True):
         self.env = env
         self.client_id = client_id
@@ -12,50 +39,85 @@ class MqttClient:
         self.clean_session = clean_session
 
         self.connected = False
-        self.backoff = 1.0
+        self._bo_idx = 0  # Index into _BACKOFF_TABLE
         self.retry_count = 0  # Tracks retry attempts for GUI
-        self.msg_queue = []
+        self.msg_queue = deque(maxlen=MSG_QUEUE_LIMIT)
+        # Up to this many queued publishes (and bytes) go out in one radio burst
+        self.max_batch = 16
+        self.max_batch_bytes = 512
         self.keep_alive = 10.0
         self.last_packet_time = 0.0
+        # Set by the broker's keep-alive sweep (check_keep_alive); cleared when the ping goes out
+        self._ping_due = False
+        # Fired by wake(); the idle loop sleeps on it instead of polling
+        self._wakeup = env.event()
+
+        # Reconnect jitter from the node's seeded RNG (falls back to the global random module)
+        self._rng = getattr(parent_node, "rng", None) or random
+
+        # Hot-path constants: radio power draw and the node's energy sink
+        self._tx_p_mw = radio.tx_power_mw
+        self._rx_p_mw = radio.rx_power_mw
+        self._consume = getattr(parent_node, "consume_energy", None)
+        # RX energy is affine in message size: joules per byte plus a per-frame constant
+        self._rx_j_per_byte = radio._inv_speed * self._rx_p_mw / 1000
+        self._rx_j_fixed = radio._fixed * self._rx_p_mw / 1000
+        # Parent lookup (cached per sim timestamp by the node itself)
+        self._get_link = parent_node.get_network_link
+        # Direct broker entry points (no per-packet SimPy process); proxies without them,
+        # e.g. the WAN proxy, keep the process-based publish/ping
+        self._publish_sync = getattr(broker, "publish_sync", None)
+        self._ping_sync = getattr(broker, "ping_sync", None)
+        self._broker_ping = getattr(broker, "ping", None)
 
         self.env.process(self.network_loop())
 
     def network_loop(self):
+        """Run the loop for the client's current state; each returns when its state ends."""
         while True:
-            # 1. Manual Disconnect Check
             if self.node.state == "disconnected":
-                self.connected = False
-                yield self.env.timeout(1.0)
-                continue
-
-            # 2. Connection Handling
-            if not self.connected:
-                yield self.env.process(self.attempt_connect())
-
-            # 3. Message Handling (if connected)
-            if self.connected:
-                # A. Send Queued Messages
-                if self.msg_queue:
-                    msg = self.msg_queue.pop(0)
-                    yield self.env.process(self.send_publish(msg))
-                    self.last_packet_time = self.env.now
-
-                # B. Keep-Alive (Ping)
-                elif (self.env.now - self.last_packet_time > self.keep_alive):
-                    yield self.env.process(self.send_ping())
-                    self.last_packet_time = self.env.now
-
-                # C. Idle
-                else:
-                    yield self.env.timeout(0.1)
+                yield from self._disconnected_loop()
+            elif self.connected:
+                yield from self._connected_loop()
             else:
-                # If attempt_connect failed, it already waited (backoff).
-                # Just loop back to try again.
-                pass
+                yield from self._connecting_loop()
+
+    def _disconnected_loop(self):
+        # Manual disconnect: drop the session and wait for the user to reconnect
+        if self.connected:
+            self.connected = False
+            self.node.mark_dirty()
+        while self.node.state == "disconnected":
+            yield self.env.timeout(1.0)
+
+    def _connecting_loop(self):
+        # attempt_connect waits out the backoff itself on failure; just try again
+        while not self.connected and self.node.state != "disconnected":
+            yield from self.attempt_connect()
+
+    def _connected_loop(self):
+        env, node, queue = self.env, self.node, self.msg_queue
+        while self.connected and node.state != "disconnected":
+            # A. Send Queued Messages
+            if queue:
+                yield from self.send_publish(*self._take_batch())
+                self.last_packet_time = env.now
+                # The burst counts as activity; drop a ping the sweep flagged while it was in flight
+                self._ping_due = False
+
+            # B. Keep-Alive (Ping), requested by the broker's sweep
+            elif self._ping_due:
+                yield from self.send_ping()
+                self.last_packet_time = env.now
+                self._ping_due = False  # Also covers a sweep that ran during the ping
+
+            # C. Idle until something is queued, a ping is due or the connection changes
+            else:
+                yield self._wakeup
 
     def attempt_connect(self):
         # 1. Check Physical Link (Mesh Aware)
-        link = self.node.get_network_link()
+        link = self._get_link()
         success = False
 
         if link:
@@ -76,13 +138,15 @@ class MqttClient:
         # 2. Handle Outcome (Unified for Link Loss OR Broker Crash)
         if success:
             self.connected = True
-            self.backoff = 1.0
+            self._bo_idx = 0
             self.retry_count = 0  # Reset on success
             self.last_packet_time = self.env.now
+            self._ping_due = False
             self.node.connected_parent_id = link[1]
 
             if self.node.state in ("broker_down", "disconnected", "scanning"):
                 self.node.state = "active"
+            self.node.mark_dirty()
         else:
             # Connect Failed (due to range OR broker down)
             self.connected = False
@@ -91,20 +155,64 @@ class MqttClient:
 
             if self.node.state != "disconnected":
                 self.node.state = "scanning"
+            self.node.mark_dirty()
 
             # Exponential Backoff
-            wait = self.backoff + random.uniform(0, 1)
+            wait = self._BACKOFF_TABLE[self._bo_idx] + self._rng.random()
             yield self.env.timeout(wait)
 
-            # --- MAX CAP SET TO 10 SECONDS ---
-            self.backoff = min(self.backoff * 2, 10.0)
+            if self._bo_idx < len(self._BACKOFF_TABLE) - 1:
+                self._bo_idx += 1
+            self.node.mark_dirty()
+
+    @property
+    def backoff(self):
+        """Current base reconnect delay in seconds (shown in the GUI as next retry)."""
+        return self._BACKOFF_TABLE[self._bo_idx]
+
+    def check_keep_alive(self, now):
+        """Called by the broker's keep-alive sweep; schedules a ping once the link has idled out."""
+        if self.connected and now - self.last_packet_time >= self.keep_alive:
+            self._ping_due = True
+            self.wake()
+
+    def wake(self):
+        """End the idle wait early (message queued or connection state changed)."""
+        if not self._wakeup.triggered:
+            self._wakeup.succeed()
+            self._wakeup = self.env.event()
 
     def publish(self, topic, payload, qos=0):
         if self.node.state != "disconnected":
-            self.msg_queue.append({"t": topic, "p": payload, "q": qos})
+            self.msg_queue.append(Msg(topic, payload, qos, payload_size(payload)))
+            self.wake()
+
+    def _take_batch(self):
+        """Pop the next burst: at least one message, then up to max_batch / max_batch_bytes.
+
+        Returns (messages, total payload bytes).
+        """
+        queue = self.msg_queue
+        msg = queue.popleft()
+        batch, size = [msg], msg.size
+        while queue and len(batch) < self.max_batch and size + queue[0].size <= self.max_batch_bytes:
+            msg = queue.popleft()
+            batch.append(msg)
+            size += msg.size
+        return batch, size
 
-    def send_publish(self, msg):
-        link = self.node.get_network_link()
+    def _requeue(self, msgs):
+        # Back to the head of the queue, in their original order. These are the
+        # oldest messages, so when the queue is full they are the ones dropped;
+        # extendleft would instead push the newest publishes off the right end.
+        queue = self.msg_queue
+        room = queue.maxlen - len(queue)
+        if room < len(msgs):
+            msgs = msgs[len(msgs) - room:] if room > 0 else ()
+        queue.extendleft(reversed(msgs))
+
+    def send_publish(self, batch, size=None):
+        link = self._get_link()
 
         # If link is lost during publish, trigger disconnect -> retry loop
         if not link:
@@ -112,53 +220,71 @@ class MqttClient:
             if self.node.state != "disconnected":
                 self.node.state = "scanning"
             self.node.connected_parent_id = None
-            self.msg_queue.insert(0, msg)  # Put message back
+            self.node.mark_dirty()
+            self._requeue(batch)  # Put messages back
             return
 
-        payload_size = len(str(msg["p"]))
-        tx_time = self.radio.calculate_tx_time(payload_size)
+        # One radio burst for the whole batch
+        if size is None:
+            size = sum(msg.size for msg in batch)
+        tx_time = self.radio.calculate_tx_time(size)
         yield self.env.timeout(tx_time)
         self._consume_energy(tx_time)
 
-        try:
-            ack = yield self.env.process(
-                self.broker.publish(self.client_id, msg["t"], msg["p"], msg["q"])
-            )
-            # If QoS > 0 and no ACK, treat as connection issue
-            if msg["q"] > 0 and not ack:
+        for i, msg in enumerate(batch):
+            try:
+                if self._publish_sync is not None:
+                    delay, ack = self._publish_sync(self.client_id, msg.topic, msg.payload, msg.qos, size=msg.size)
+                    if delay:
+                        yield self.env.timeout(delay)
+                else:
+                    ack = yield self.env.process(
+                        self.broker.publish(self.client_id, msg.topic, msg.payload, msg.qos, size=msg.size)
+                    )
+                # If QoS > 0 and no ACK, treat as connection issue
+                if msg.qos > 0 and not ack:
+                    self.connected = False
+                    self.node.mark_dirty()
+                    yield self.env.timeout(1.0)
+                    self._requeue(batch[i:])
+                    return
+            except Exception:
                 self.connected = False
-                yield self.env.timeout(1.0)
-                self.msg_queue.insert(0, msg)
-        except Exception:
-            self.connected = False
-            self.msg_queue.insert(0, msg)
+                self.node.mark_dirty()
+                self._requeue(batch[i:])
+                return
 
     def send_ping(self):
         # Check link before pinging.
         # If out of range, this fails immediately, triggering retry loop.
-        link = self.node.get_network_link()
+        link = self._get_link()
         if not link:
             self.connected = False
+            self.node.mark_dirty()
             return
 
         tx_time = self.radio.calculate_tx_time(2)
         yield self.env.timeout(tx_time)
         self._consume_energy(tx_time)
         try:
-            if hasattr(self.broker, 'ping'):
-                yield self.env.process(self.broker.ping(self.client_id))
+            if self._ping_sync is not None:
+                delay, _ = self._ping_sync(self.client_id)
+                if delay:
+                    yield self.env.timeout(delay)
+            elif self._broker_ping is not None:
+                yield self.env.process(self._broker_ping(self.client_id))
             else:
                 yield self.env.timeout(0.01)
         except Exception:
             self.connected = False
+            self.node.mark_dirty()
 
     def on_message(self, msg):
-        rx_time = self.radio.calculate_tx_time(len(str(msg["payload"])))
-        p_mw = self.radio.config["rx_power_mw"]
-        if hasattr(self.node, "consume_energy"):
-            self.node.consume_energy(p_mw * rx_time / 1000)
+        consume = self._consume
+        if consume is not None:
+            # Sized once by the publisher
+            consume(msg["size"] * self._rx_j_per_byte + self._rx_j_fixed)
 
     def _consume_energy(self, duration_sec):
-        p_mw = self.radio.config["tx_power_mw"]
-        if hasattr(self.node, "consume_energy"):
-            self.node.consume_energy(p_mw * duration_sec / 1000)
\ No newline at end of file
+        if self._consume is not None:
+            self._consume(self._tx_p_mw * duration_sec / 1000)
\ No newline at end of file
@@ -1,12 +1,26 @@
 """Models WAN latency/loss between gateway and cloud broker."""
 
-import random
+import inspect
+
+from ..utils.random_helpers import UniformPool
 
 class WanLink:
-    def __init__(self, env, latency_ms=(50, 200), loss_rate=0.01):
+    def __init__(self, env, latency_ms=(50, 200), loss_rate=0.01, rng=None):
         self.env = env
         self.latency_range = (latency_ms[0]/1000.0, latency_ms[1]/1000.0)
         self.loss_rate = loss_rate
+        self._latency_min = self.latency_range[0]
+        self._latency_span = self.latency_range[1] - self.latency_range[0]
+        # One pool of unit draws serves both the delay and the loss coin
+        self._unit = UniformPool(0.0, 1.0, rng=rng)
+
+    def sample_latency(self):
+        """One-way WAN delay in seconds."""
+        return self._latency_min + self._unit() * self._latency_span
+
+    def drop(self):
+        """True if this packet is lost on the WAN."""
+        return self._unit() < self.loss_rate
 
     def send(self, destination_callback, *args, **kwargs):
         """
@@ -18,17 +32,18 @@ class WanLink:
 
     def _transmission_process(self, callback, args, kwargs):
         # 1. Calculate Delay
-        delay = random.uniform(*self.latency_range)
-        yield self.env.timeout(delay)
+        yield self.env.timeout(self.sample_latency())
 
         # 2. Check for Packet Loss
-        if random.random() < self.loss_rate:
+        if self.drop():
             # Packet dropped silently
             return None
 
-        # 3. Deliver
-        # If the destination is a coroutine (SimPy process), yield it
+        # 3. Deliver: plain callbacks return directly; generators (e.g. broker.publish)
+        # run inline in this process rather than in a nested one
         result = callback(*args, **kwargs)
-        if hasattr(result, 'callbacks'):  # Basic check if it's a SimPy event/process
-            yield result
-        return result
\ No newline at end of file
+        if inspect.isgenerator(result):
+            result = yield from result
+        elif hasattr(result, 'callbacks'):  # Already a SimPy event/process
+            result = yield result
+        return result
@@ -1,26 +1,52 @@
-"""Exports BLE, Wi-Fi, and Zigbee radio profiles (PHY + MAC basics)."""
+"""Exports BLE, Wi-Fi, and Zigbee radio profiles (PHY + MAC basics).
 
-from .wifi import WifiRadio
-from .ble import BleRadio
-from .zigbee import ZigbeeRadio
-import yaml
+Radio classes and their YAML profiles are loaded on first use, so importing
+this package costs nothing for protocols an experiment never creates.
+"""
+
+import functools
+import importlib
 import os
 
+from .config import RadioConfig
+
+
+# name -> (submodule, class name)
+_RADIO_SPEC = {
+    "wifi": ("wifi", "WifiRadio"),
+    "ble": ("ble", "BleRadio"),
+    "zigbee": ("zigbee", "ZigbeeRadio"),
+}
+_CLASS_TO_NAME = {cls_name: name for name, (_, cls_name) in _RADIO_SPEC.items()}
+
 
-# Load configs once
+# Each profile is parsed once, on first request
+@functools.lru_cache(maxsize=None)
 def load_config(name):
+    import yaml
+
     path = os.path.join(os.path.dirname(__file__), f"../configs/{name}.yaml")
     with open(path, "r") as f:
-        return yaml.safe_load(f)
+        return RadioConfig.from_dict(yaml.safe_load(f))
 
 
-RADIOS = {
-    "wifi": (WifiRadio, load_config("wifi")),
-    "ble": (BleRadio, load_config("ble")),
-    "zigbee": (ZigbeeRadio, load_config("zigbee")),
-}
+@functools.lru_cache(maxsize=None)
+def _get(name):
+    module, cls_name = _RADIO_SPEC[name]
+    cls = getattr(importlib.import_module(f".{module}", __package__), cls_name)
+    return cls, load_config(name)
 
 
 def create_radio(name, env):
-    cls, cfg = RADIOS.get(name.lower(), (WifiRadio, load_config("wifi")))
+    # Unknown names fall back to Wi-Fi; every radio of a protocol shares its one frozen config
+    name = name.lower()
+    cls, cfg = _get(name if name in _RADIO_SPEC else "wifi")
     return cls(env, cfg)
+
+
+def __getattr__(attr):
+    # Keep `from src.radios import WifiRadio` working without the eager import
+    name = _CLASS_TO_NAME.get(attr)
+    if name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {attr!r}")
+    return _get(name)[0]
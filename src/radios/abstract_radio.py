@@ -4,17 +4,36 @@ from abc import ABC, abstractmethod
 class AbstractRadio(ABC):
     def __init__(self, env, config):
         self.env = env
-        self.config = config
+        self.config = config  # RadioConfig (frozen, may be shared between radios)
+        self.tx_power_mw = config.tx_power_mw
+        self.rx_power_mw = config.rx_power_mw
+        self.range_m = config.range_m  # Per-radio; the GUI can change it via set_range
+        self._range_sq = self.range_m * self.range_m
+
+        # TX time is affine in payload size; fold the per-radio model into two constants
+        bytes_per_s, header, access_delay = self._link_params()
+        self._inv_speed = 1.0 / bytes_per_s
+        self._fixed = header * self._inv_speed + access_delay
 
     @abstractmethod
+    def _link_params(self):
+        """(throughput in bytes/s, per-frame header bytes, fixed medium-access delay in s)."""
+
     def calculate_tx_time(self, size_bytes):
-        pass
+        return size_bytes * self._inv_speed + self._fixed
 
     @abstractmethod
     def get_energy_per_bit(self):
         pass
 
+    def set_range(self, range_m):
+        self.range_m = float(range_m)
+        self._range_sq = self.range_m * self.range_m
+
     def can_reach(self, dist_m):
-        # Simple hard cutoff based on range_m from config
+        return self.can_reach_sq(dist_m * dist_m)
+
+    def can_reach_sq(self, dist_sq):
+        # Simple hard cutoff based on range_m from config, on squared distance (no sqrt)
         # In a more complex sim, this would use path loss models
-        return dist_m <= self.config["range_m"]
+        return dist_sq <= self._range_sq
@@ -0,0 +1,26 @@
+"""Typed, read-only view of a radio profile YAML (``src/configs/<name>.yaml``)."""
+
+from dataclasses import dataclass, fields
+from typing import Optional, Tuple
+
+
+@dataclass(frozen=True)
+class RadioConfig:
+    range_m: float
+    tx_power_mw: float
+    rx_power_mw: float
+    throughput_kbps: Optional[float] = None
+    throughput_mbps: Optional[float] = None
+    contention_window: Optional[Tuple[int, int]] = None
+    sleep_power_mw: Optional[float] = None
+    idle_power_mw: Optional[float] = None
+    duty_cycle_limit: Optional[float] = None
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build from parsed YAML; keys this class does not model are ignored."""
+        known = {f.name for f in fields(cls)}
+        values = {k: v for k, v in data.items() if k in known}
+        if values.get("contention_window") is not None:
+            values["contention_window"] = tuple(values["contention_window"])
+        return cls(**values)
@@ -4,17 +4,16 @@ from .abstract_radio import AbstractRadio
 
 
 class ZigbeeRadio(AbstractRadio):
-    def calculate_tx_time(self, size_bytes):
+    def _link_params(self):
         # 250kbps
-        speed_bps = self.config["throughput_kbps"] * 1000 / 8
+        speed_bps = self.config.throughput_kbps * 1000 / 8
         # Zigbee max payload is small (~127 bytes PHY), huge fragmentation overhead if large
         # We assume simplified packetization
         header = 30  # PHY+MAC
-        tx_time = (size_bytes + header) / speed_bps
 
         # CSMA/CA for 802.15.4 is slower than Wi-Fi
         backoff = 0.002  # 2ms avg backoff
-        return tx_time + backoff
+        return speed_bps, header, backoff
 
     def get_energy_per_bit(self):
-        return self.config["tx_power_mw"]
+        return self.config.tx_power_mw
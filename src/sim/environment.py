@@ -43,6 +43,10 @@ class SimulationEnvironment:
         self.env = simpy.Environment()
         self.rng = random.Random(self.seed)
         self._processes: Dict[str, simpy.events.Process] = {}
+        # name -> "active"/"done", updated as processes start and finish
+        self._status: Dict[str, str] = {}
+        # Raw ``env.timeout`` for hot loops that want to skip the wrapper
+        self.env_timeout = self.env.timeout
 
     # ------------------------------------------------------------------
     # basic helpers
@@ -55,9 +59,10 @@ class SimulationEnvironment:
     def timeout(self, duration: float) -> simpy.events.Timeout:
         """Shortcut for ``env.timeout`` to keep call-sites tidy."""
 
-        if duration < 0:
-            raise ValueError("Timeout duration must be non-negative")
-        return self.env.timeout(duration)
+        # simpy.Timeout rejects negative delays itself; this only sharpens the
+        # message and is stripped under ``python -O``.
+        assert duration >= 0, "Timeout duration must be non-negative"
+        return self.env_timeout(duration)
 
     # ------------------------------------------------------------------
     # process management
@@ -76,12 +81,20 @@ class SimulationEnvironment:
             raise ValueError(f"Process '{name}' already registered")
         process = self.env.process(generator_factory(self.env))
         self._processes[name] = process
+        self._status[name] = "active"
+        process.callbacks.append(lambda _event: self._mark_done(name, process))
         return process
 
+    def _mark_done(self, name: str, process: simpy.events.Process) -> None:
+        # Ignore finishes of cancelled processes whose name was re-registered
+        if self._processes.get(name) is process:
+            self._status[name] = "done"
+
     def cancel_process(self, name: str) -> None:
         """Stop a registered process if it is still alive."""
 
         process = self._processes.pop(name, None)
+        self._status.pop(name, None)
         if process is not None and not process.triggered:
             process.interrupt("cancelled")
 
@@ -125,8 +138,4 @@ class SimulationEnvironment:
     def describe_processes(self) -> Dict[str, str]:
         """Return a summary of registered processes for debugging/GUI."""
 
-        summary: Dict[str, str] = {}
-        for name, process in self._processes.items():
-            status = "done" if process.processed else "active"
-            summary[name] = status
-        return summary
+        return dict(self._status)
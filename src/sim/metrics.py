@@ -6,6 +6,9 @@ from typing import Any, Dict, List, MutableMapping, Set, Deque
 
 @dataclass
 class MessageInfo:
+    # One per published message id; slots keep long runs' metrics table small
+    __slots__ = ("topic", "qos", "size_bytes", "publisher_id", "publish_time")
+
     topic: str
     qos: int
     size_bytes: int
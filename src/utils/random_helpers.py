@@ -1 +1,38 @@
 """Deterministic random/seeding utilities shared across modules."""
+
+import random
+
+import numpy as np
+
+
+class UniformPool:
+    """Pre-drawn ``uniform(low, high)`` samples served one at a time.
+
+    Samples are generated ``size`` at a time with NumPy and handed out from a
+    ring buffer, which is much cheaper per draw than ``random.uniform`` on hot
+    paths. ``rng`` may be a NumPy ``Generator`` or a ``random.Random`` to seed
+    one from; by default the stdlib ``random`` module seeds it, so
+    ``random.seed(...)`` still makes runs reproducible.
+    """
+
+    def __init__(self, low, high, size=4096, rng=None):
+        self.low = low
+        self.high = high
+        self.size = size
+        if not isinstance(rng, np.random.Generator):
+            rng = np.random.default_rng((rng or random).getrandbits(64))
+        self._rng = rng
+        self._refill()
+
+    def _refill(self):
+        # Python floats: cheaper to index and hand to env.timeout than NumPy scalars
+        self._buf = self._rng.uniform(self.low, self.high, self.size).tolist()
+        self._idx = 0
+
+    def __call__(self):
+        i = self._idx
+        if i == self.size:
+            self._refill()
+            i = 0
+        self._idx = i + 1
+        return self._buf[i]
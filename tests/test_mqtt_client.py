@@ -0,0 +1,127 @@
+"""MQTT client keep-alive, publish bursts and send-queue requeueing."""
+
+import simpy
+
+from src.mqtt.broker import KEEPALIVE_TICK, MqttBroker
+from src.mqtt.client import MSG_QUEUE_LIMIT, MqttClient, Msg
+from src.radios import create_radio
+from src.sim.metrics import MetricsCollector
+
+
+class _Node:
+    """Minimal parent node: always in range of a gateway, no battery."""
+
+    def __init__(self):
+        self.state = "scanning"
+        self.rng = None
+        self.connected_parent_id = None
+
+    def get_network_link(self):
+        return (1.0, "Gateway")
+
+    def mark_dirty(self):
+        pass
+
+
+def _client(ack_delay=None):
+    """A client on a live broker; returns (env, client, ping timestamps)."""
+    env = simpy.Environment()
+    broker = MqttBroker(env, MetricsCollector())
+    pings = []
+    ping_sync = broker.ping_sync
+
+    def record_ping(client_id):
+        pings.append(env.now)
+        return ping_sync(client_id)
+
+    broker.ping_sync = record_ping
+    if ack_delay is not None:
+        # Slow QoS-1 ACK so the keep-alive sweep runs while the burst is in flight
+        broker.publish_sync = lambda *args, **kwargs: (ack_delay, True)
+
+    client = MqttClient(env, "c", broker, create_radio("wifi", env), _Node())
+    return env, client, pings
+
+
+def _publish_at(env, client, when):
+    def publish():
+        yield env.timeout(when - env.now)
+        client.publish("sensors/temp", 21.5, qos=1)
+
+    env.process(publish())
+
+
+def test_idle_client_pings_within_one_tick_of_keep_alive():
+    env, client, pings = _client()
+    env.run(until=1)
+    assert client.connected
+    connected_at = client.last_packet_time
+
+    env.run(until=connected_at + client.keep_alive + KEEPALIVE_TICK + 0.5)
+    assert len(pings) == 1
+    assert connected_at + client.keep_alive <= pings[0] <= connected_at + client.keep_alive + KEEPALIVE_TICK
+
+
+def test_burst_resets_keep_alive():
+    env, client, pings = _client()
+    _publish_at(env, client, 9.5)
+    env.run(until=15)
+    assert pings == []
+
+
+def test_no_extra_ping_after_slow_burst():
+    # The sweeps at 11 s and 12 s see a stale last_packet_time while the ACK is pending
+    env, client, pings = _client(ack_delay=2.0)
+    _publish_at(env, client, 10.5)
+    env.run(until=16)
+    assert pings == []
+    assert client.last_packet_time > 12.5
+
+
+def _msgs(sizes, start=0):
+    return [Msg(f"t/{start + i}", None, 0, size) for i, size in enumerate(sizes)]
+
+
+def test_batch_respects_max_batch():
+    _, client, _ = _client()
+    client.msg_queue.extend(_msgs([10] * 20))
+    batch, size = client._take_batch()
+    assert len(batch) == client.max_batch
+    assert size == 10 * client.max_batch
+    assert len(client.msg_queue) == 20 - client.max_batch
+
+
+def test_batch_respects_max_batch_bytes():
+    _, client, _ = _client()
+    client.msg_queue.extend(_msgs([200, 200, 200]))
+    batch, size = client._take_batch()
+    assert [m.topic for m in batch] == ["t/0", "t/1"]
+    assert size == 400
+
+
+def test_batch_always_takes_an_oversized_message():
+    _, client, _ = _client()
+    client.msg_queue.extend(_msgs([1000, 10]))
+    batch, size = client._take_batch()
+    assert [m.topic for m in batch] == ["t/0"]
+    assert size == 1000
+    assert len(client.msg_queue) == 1
+
+
+def test_requeue_restores_order():
+    _, client, _ = _client()
+    client.msg_queue.extend(_msgs([10] * 3, start=3))
+    client._requeue(_msgs([10] * 3))
+    assert [m.topic for m in client.msg_queue] == [f"t/{i}" for i in range(6)]
+
+
+def test_requeue_onto_full_queue_keeps_newest():
+    _, client, _ = _client()
+    queued = _msgs([10] * (MSG_QUEUE_LIMIT - 2), start=4)
+    client.msg_queue.extend(queued)
+    # t/0..t/3 are older than everything queued; only the newest two of them fit
+    client._requeue(_msgs([10] * 4))
+    topics = [m.topic for m in client.msg_queue]
+    assert len(topics) == MSG_QUEUE_LIMIT
+    assert topics[:3] == ["t/2", "t/3", "t/4"]
+    assert topics[-1] == queued[-1].topic
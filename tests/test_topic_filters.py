@@ -0,0 +1,72 @@
+"""Topic filter matching and retained-message replay in the MQTT broker."""
+
+import pytest
+import simpy
+
+from src.mqtt.broker import MqttBroker, compile_filter
+from src.sim.metrics import MetricsCollector
+
+
+@pytest.mark.parametrize(
+    "sub_filter, topic, expected",
+    [
+        ("sensors/temp", "sensors/temp", True),
+        ("sensors/temp", "sensors/humidity", False),
+        ("sensors/+", "sensors/temp", True),
+        ("sensors/+", "sensors/temp/raw", False),
+        ("sensors/+", "sensors", False),
+        ("+/gps", "mobile/gps", True),
+        ("+/+", "mobile/gps", True),
+        ("sensors/#", "sensors/temp", True),
+        ("sensors/#", "sensors/temp/raw", True),
+        ("sensors/#", "sensors", True),
+        ("sensors/#", "sensorsX/temp", False),
+        ("#", "any/topic/at/all", True),
+        ("a.b/+", "a.b/c", True),
+        ("a.b/+", "aXb/c", False),
+    ],
+)
+def test_compile_filter(sub_filter, topic, expected):
+    assert bool(compile_filter(sub_filter).fullmatch(topic)) is expected
+
+
+class _Subscriber:
+    def __init__(self):
+        self.topics = []
+
+    def on_message(self, msg):
+        self.topics.append(msg["topic"])
+
+
+def _replayed(sub_filter):
+    """Retain a few topics, then subscribe with sub_filter and return what gets replayed."""
+    env = simpy.Environment()
+    broker = MqttBroker(env, MetricsCollector())
+    for topic in ("sensors/temp", "sensors/humidity", "mobile/gps"):
+        broker.publish_sync("pub", topic, 21.5, retain=True)
+
+    sub = _Subscriber()
+
+    def scenario():
+        yield env.process(broker.connect("sub", sub))
+        broker.subscribe("sub", sub_filter)
+
+    env.process(scenario())
+    env.run(until=1)
+    return sorted(sub.topics)
+
+
+def test_retained_replay_wildcard_all():
+    assert _replayed("#") == ["mobile/gps", "sensors/humidity", "sensors/temp"]
+
+
+def test_retained_replay_exact():
+    assert _replayed("sensors/temp") == ["sensors/temp"]
+
+
+def test_retained_replay_single_level():
+    assert _replayed("sensors/+") == ["sensors/humidity", "sensors/temp"]
+
+
+def test_retained_replay_no_match():
+    assert _replayed("work/+") == []